@@ -0,0 +1,43 @@
+import os
+import tempfile
+import pandas as pd
+
+csv_path = 'public/data/brokers.csv'
+parquet_path = 'public/data/brokers.parquet'
+
+def load_brokers(columns=None, nrows=None):
+    # columns are positional indexes into the brokers.csv header
+    # nrows limits the read to the first rows (first batch of the sidecar, or a partial CSV parse)
+    # Reuse the parquet sidecar while it is newer than the CSV, otherwise rebuild it
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(parquet_path)
+        names = pf.schema_arrow.names
+        selected = None if columns is None else [names[i] for i in columns]
+        if nrows is not None:
+            # Stop after the first batch instead of decoding a whole (up to ~1M row) row group
+            batch = next(pf.iter_batches(batch_size=max(nrows, 1), columns=selected), None)
+            if batch is None:
+                return pf.schema_arrow.empty_table().select(selected or names).to_pandas()
+            return batch.to_pandas().iloc[:nrows]
+        return pd.read_parquet(parquet_path, columns=selected)
+
+    if nrows is not None:
+        # A partial read is not enough to build the sidecar from
+        df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype='string', keep_default_na=False, nrows=nrows)
+        return df if columns is None else df.iloc[:, columns]
+
+    # Keep every cell as its raw CSV text: no type inference, and 'NA'/'N/A'/'null'/empty stay strings
+    df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype='string', keep_default_na=False)
+    # Write to a temp file and swap it in, so a failed write never leaves a truncated sidecar
+    fd, tmp_path = tempfile.mkstemp(prefix='brokers.parquet.', dir=os.path.dirname(parquet_path))
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, compression='zstd', index=False)
+        os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        print(f"Skipping brokers.parquet cache: {e}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df if columns is None else df.iloc[:, columns]
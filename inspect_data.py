@@ -1,12 +1,15 @@
 import pandas as pd
+from brokers_cache import load_brokers
 
 try:
-    # Read the CSV file without header to inspect raw data
-    df = pd.read_csv('public/data/brokers.csv', header=None)
+    # Load the cached broker data as raw text
+    # Only columns 0 (Company), 1 (Date), 3 (Broker), 5 (Target Price) are needed
+    df = load_brokers(columns=[0, 1, 3, 5])
+    df.columns = [0, 1, 3, 5]
     
     # Filter for rows where the first column (Company) contains '2330'
     # Column 0 is Company
-    target_rows = df[df[0].astype(str).str.contains('2330', na=False)]
+    target_rows = df[df[0].str.contains('2330', na=False, regex=False)]
     
     print(f"Found {len(target_rows)} rows for 2330")
     
@@ -19,14 +22,19 @@ try:
     result['Date'] = pd.to_datetime(result['Date'], errors='coerce')
     result = result.sort_values('Date', ascending=False)
     
+    # Broker names repeat heavily, so store them as integer category codes
+    result['Broker'] = result['Broker'].astype('category')
+    
     print(result.head(30).to_string())
     
     # Check specifically for the brokers mentioned: "凱基證券", "群益證券"
     problem_brokers = ["凱基證券", "群益證券", "宏遠證券", "永豐金證券", "康和證券"]
     print("\n--- Problem Brokers Latest Data ---")
+    # Split by broker in a single pass; result is already sorted so each group stays in date order
+    groups = dict(tuple(result.groupby('Broker', sort=False, observed=True)))
     for broker in problem_brokers:
-        broker_data = result[result['Broker'] == broker]
-        if not broker_data.empty:
+        broker_data = groups.get(broker)
+        if broker_data is not None:
             print(f"\nBroker: {broker}")
             print(broker_data.head(5).to_string())
         else:
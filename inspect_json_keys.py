@@ -1,14 +1,15 @@
-import json
+import ijson
 import sys
 
 def inspect_json(filepath):
     print(f"--- Inspecting {filepath} ---")
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if isinstance(data, list) and len(data) > 0:
-                print("Keys in first record:", list(data[0].keys()))
-                print("First record sample:", {k: data[0][k] for k in list(data[0].keys())[:5]})
+        with open(filepath, 'rb') as f:
+            # Stream only the first array element instead of loading the whole file
+            first = next(ijson.items(f, 'item', use_float=True), None)
+            if first is not None:
+                print("Keys in first record:", list(first.keys()))
+                print("First record sample:", {k: first[k] for k in list(first.keys())[:5]})
             else:
                 print("Data is not a list or is empty.")
     except Exception as e:
@@ -1,7 +1,7 @@
-import pandas as pd
+from brokers_cache import load_brokers
 
 try:
-    df = pd.read_csv('public/data/brokers.csv', encoding='utf-8-sig')
+    df = load_brokers(nrows=1)
     print("Columns:")
     print(df.columns.tolist())
     
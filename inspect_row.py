@@ -1,17 +1,15 @@
-import csv
+from brokers_cache import load_brokers
 
 try:
-    with open('public/data/brokers.csv', 'r', encoding='utf-8-sig') as f:
-        reader = csv.reader(f)
-        headers = next(reader)
-        print("Headers:")
-        for i, h in enumerate(headers):
-            print(f"{i}: {h}")
+    df = load_brokers(nrows=1)
+    print("Headers:")
+    for i, h in enumerate(df.columns):
+        print(f"{i}: {h}")
+    
+    print("\nFirst Data Row:")
+    row = df.iloc[0]
+    for i, val in enumerate(row):
+        print(f"{i}: {val}")
         
-        print("\nFirst Data Row:")
-        row = next(reader)
-        for i, val in enumerate(row):
-            print(f"{i}: {val}")
-            
 except Exception as e:
     print(f"Error: {e}")
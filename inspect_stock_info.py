@@ -1,4 +1,4 @@
-import json
+import orjson
 import os
 
 filepath = 'public/data/stock_info.json'
@@ -8,8 +8,8 @@ if not os.path.exists(filepath):
     print("File not found!")
 else:
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            data = orjson.loads(f.read())
             print(f"Loaded {len(data)} records.")
             if len(data) > 0:
                 print("Keys:", list(data[0].keys()))
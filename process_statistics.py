@@ -1,88 +1,129 @@
+import numpy as np
 import pandas as pd
-import json
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import os
 import glob
+import codecs
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
 
 # Define paths
 base_dir = r"c:\Users\User\Desktop\台股資料庫\網站設計\原始檔案\資料庫1(歷史月、季漲跌機率、幅度統計)"
 output_dir = r"c:\Users\User\Desktop\台股資料庫\網站設計\stock-vision\public\data"
 
-# Ensure output directory exists
-os.makedirs(output_dir, exist_ok=True)
+# Strip the sub-industry block and mark cells that are non-empty and not '0'
+# values is a 2-D unicode array with missing cells already blanked
+def _sub_industry_cells(values):
+    text = np.char.strip(values)
+    return text, (text != "") & (text != "0")
 
-def process_rankings(file_path, output_path):
-    print(f"Processing rankings from {file_path}...")
+def _detect_encoding(file_path):
+    # Guess between utf-8 and cp950 from the first 4KB so the CSV is only parsed once
+    with open(file_path, 'rb') as f:
+        head = f.read(4096)
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8'
+    if head.isascii():
+        return 'cp950'
     try:
-        xl = pd.ExcelFile(file_path)
-        rankings = {}
+        # Incremental decode tolerates a multi-byte character cut at the 4KB boundary
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return 'cp950'
+    return 'utf-8'
+
+# Define markers for different tables
+markers = {
+    "stocks": "[個股排名 (Top 30)]",
+    "industries": "[產業排名 (Top 10)]",
+    "sub_industries": "[細產業排名 (Top 10)]",
+    "related_industries": "[相關產業排名 (Top 10)]",
+    "related_groups": "[相關集團排名 (Top 10)]",
+    "industry_types": "[產業別排名 (Top 10)]"
+}
+
+marker_lookup = {marker: key for key, marker in markers.items()}
+
+def _process_ranking_sheet(sheet, df):
+    print(f"  Processing sheet: {sheet}")
+    arr = df.to_numpy(dtype=object)
+    present = df.notna().to_numpy()
+    
+    # Column-oriented sections: {"columns": {header: [values...]}, "length": row count}
+    sheet_data = {key: {"columns": {}, "length": 0} for key in markers.keys()}
+    current_section = None
+    headers = None
+    
+    for i in range(arr.shape[0]):
+        row = arr[i]
+        row_present = present[i]
+
+        # Check if row is a marker (every marker starts with '[')
+        row_str = str(row[0]).strip() if row_present[0] else ""
         
-        # Define markers for different tables
-        markers = {
-            "stocks": "[個股排名 (Top 30)]",
-            "industries": "[產業排名 (Top 10)]",
-            "sub_industries": "[細產業排名 (Top 10)]",
-            "related_industries": "[相關產業排名 (Top 10)]",
-            "related_groups": "[相關集團排名 (Top 10)]",
-            "industry_types": "[產業別排名 (Top 10)]"
-        }
-
-        for sheet in xl.sheet_names:
-            print(f"  Processing sheet: {sheet}")
-            df = xl.parse(sheet, header=None)
-            
-            sheet_data = {key: [] for key in markers.keys()}
-            current_section = None
-            headers = None
+        if row_str.startswith('['):
+            key = marker_lookup.get(row_str)
+            if key is None:
+                # Marker cells with extra text still count, as with the old substring check
+                key = next((k for k, marker in markers.items() if marker in row_str), None)
+            if key is not None:
+                current_section = key
+                headers = None # Reset headers for new section
+                continue
+
+        if current_section:
+            # If we haven't found headers for this section yet, this row might be the header
+            if headers is None:
+                # Check if this row looks like a header (not empty)
+                # Usually the row immediately after marker is header
+                clean_row = [str(x).strip() for x in row[row_present]]
+                if clean_row:
+                    # Map each header to its column index; the last one wins on duplicates
+                    headers = {header: idx for idx, header in enumerate(clean_row)}
+                    section = sheet_data[current_section]
+                    for header in headers:
+                        section["columns"].setdefault(header, [""] * section["length"])
+                continue
             
-            for i, row in df.iterrows():
-                # Check if row contains a marker
-                row_str = str(row[0]).strip() if pd.notna(row[0]) else ""
-                
-                found_marker = False
-                for key, marker in markers.items():
-                    if marker in row_str:
-                        current_section = key
-                        headers = None # Reset headers for new section
-                        found_marker = True
-                        break
+            # If we have headers, this is a data row
+            # Check if it's empty or looks like end of table
+            if not row_present[0] and not row_present[1]:
+                continue
                 
-                if found_marker:
-                    continue
-
-                if current_section:
-                    # If we haven't found headers for this section yet, this row might be the header
-                    if headers is None:
-                        # Check if this row looks like a header (not empty)
-                        # Usually the row immediately after marker is header
-                        clean_row = [str(x).strip() for x in row if pd.notna(x)]
-                        if clean_row:
-                            headers = clean_row
-                        continue
-                    
-                    # If we have headers, this is a data row
-                    # Check if it's empty or looks like end of table
-                    if pd.isna(row[0]) and pd.isna(row[1]):
-                        continue
-                        
-                    # Map row data to headers
-                    row_data = {}
-                    has_data = False
-                    for idx, header in enumerate(headers):
-                        if idx < len(row):
-                            val = row[idx]
-                            if pd.notna(val):
-                                row_data[header] = val
-                                has_data = True
-                            else:
-                                row_data[header] = ""
-                    
-                    if has_data:
-                        sheet_data[current_section].append(row_data)
-
-            rankings[sheet] = sheet_data
+            # Append row data to the header columns
+            if not any(row_present[idx] for idx in headers.values()):
+                continue
+            
+            section = sheet_data[current_section]
+            for header, values in section["columns"].items():
+                idx = headers.get(header)
+                values.append(row[idx] if idx is not None and row_present[idx] else "")
+            section["length"] += 1
+
+    return sheet_data
+
+def process_rankings(file_path, output_path):
+    print(f"Processing rankings from {file_path}...")
+    try:
+        # Parse every sheet in one call, preferring the Rust-based calamine reader
+        # (ImportError without python-calamine, ValueError on pandas < 2.2 which lacks the engine)
+        try:
+            sheets = pd.read_excel(file_path, sheet_name=None, header=None, engine='calamine')
+        except (ImportError, ValueError):
+            sheets = pd.read_excel(file_path, sheet_name=None, header=None)
+
+        # Sheets are only a few dozen rows each, so parse them in this (already parallel) task
+        rankings = {sheet: _process_ranking_sheet(sheet, df) for sheet, df in sheets.items()}
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(rankings, f, ensure_ascii=False, indent=2)
+        # One compact JSON object per line (JSONL): {"sheet", "section", "columns", "length"}
+        with open(output_path, 'wb') as f:
+            for sheet, sheet_data in rankings.items():
+                for key, section in sheet_data.items():
+                    record = {"sheet": sheet, "section": key, **section}
+                    f.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
         print(f"Saved rankings to {output_path}")
     except Exception as e:
         print(f"Error processing rankings {file_path}: {e}")
@@ -100,15 +141,9 @@ def process_raw_stats(file_path, output_path):
             print(f"  Found {len(sub_industry_cols)} potential sub-industry columns starting from {sub_industry_cols[0]}")
             
             # Create a new column '細產業列表' by combining non-null values from these columns
-            def get_sub_industries(row):
-                industries = []
-                for col in sub_industry_cols:
-                    val = row[col]
-                    if pd.notna(val) and str(val).strip() != "" and str(val).strip() != "0":
-                        industries.append(str(val).strip())
-                return industries
-
-            df['細產業列表'] = df.apply(get_sub_industries, axis=1)
+            values = df.iloc[:, 51:].fillna('').to_numpy(dtype=str)
+            text, mask = _sub_industry_cells(values)
+            df['細產業列表'] = [text[i, mask[i]].tolist() for i in range(len(text))]
         else:
             df['細產業列表'] = []
 
@@ -116,55 +151,104 @@ def process_raw_stats(file_path, output_path):
         
         print(f"  Columns: {df.columns.tolist()[:5]}...")
         
-        data = df.to_dict(orient='records')
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False) # Minify to save space
+        # Stream records one at a time instead of building the full list of dicts
+        columns = df.columns.tolist()
+        with open(output_path, 'wb') as f:
+            f.write(b'[')
+            for i, values in enumerate(df.itertuples(index=False, name=None)):
+                if i:
+                    f.write(b',')
+                f.write(orjson.dumps(dict(zip(columns, values)), option=orjson.OPT_SERIALIZE_NUMPY)) # Minify to save space
+            f.write(b']')
         print(f"Saved raw stats to {output_path}")
     except Exception as e:
         print(f"Error processing raw stats {file_path}: {e}")
 
+def _read_stock_csv(file_path, encoding):
+    read_options = pacsv.ReadOptions(encoding=encoding)
+    tbl = pacsv.read_csv(file_path, read_options=read_options)
+    # pandas kept date/time-looking text as-is, so re-read those columns as strings
+    temporal = {
+        field.name: pa.string() for field in tbl.schema
+        if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type) or pa.types.is_time(field.type)
+    }
+    if temporal:
+        tbl = pacsv.read_csv(file_path, read_options=read_options,
+                             convert_options=pacsv.ConvertOptions(column_types=temporal))
+    return tbl
+
 def process_stock_info(files, output_path):
     print(f"Processing stock info from {files}...")
     try:
         all_info = []
         for file_path in files:
             if os.path.exists(file_path):
+                encoding = _detect_encoding(file_path)
                 try:
                     # Try to find header for stock list too, just in case
                     # Assuming header is on row 0 for these too based on standard CSV
-                    df = pd.read_csv(file_path, encoding='cp950', header=0)
+                    tbl = _read_stock_csv(file_path, encoding)
                 except UnicodeDecodeError:
-                    print(f"cp950 failed for {file_path}, trying utf-8...")
-                    df = pd.read_csv(file_path, encoding='utf-8', header=0)
+                    tbl = None
+                
+                # The probe only sees the start of the file, so retry with the other encoding.
+                # A wrong cp950 guess raises UnicodeDecodeError, while a wrong utf-8 guess
+                # leaves the undecodable columns typed as binary instead.
+                if tbl is None or any(pa.types.is_binary(t) or pa.types.is_large_binary(t) for t in tbl.schema.types):
+                    fallback = 'utf-8' if encoding == 'cp950' else 'cp950'
+                    print(f"{encoding} failed for {file_path}, trying {fallback}...")
+                    tbl = _read_stock_csv(file_path, fallback)
                 
                 # Rename '代號' to '代碼' if it exists
-                if '代號' in df.columns:
-                    df = df.rename(columns={'代號': '代碼'})
+                if '代號' in tbl.column_names:
+                    tbl = tbl.rename_columns(['代碼' if c == '代號' else c for c in tbl.column_names])
                 
-                df = df.fillna('')
-                all_info.extend(df.to_dict(orient='records'))
+                # Missing cells become '' as before
+                all_info.extend(
+                    {k: '' if v is None else v for k, v in record.items()}
+                    for record in tbl.to_pylist()
+                )
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(all_info, f, ensure_ascii=False, indent=2)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(all_info, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
         print(f"Saved stock info to {output_path}")
     except Exception as e:
         print(f"Error processing stock info: {e}")
 
-# 1. Process Rankings
-process_rankings(os.path.join(base_dir, "Stock_Analysis_Report_3Year.xlsx"), os.path.join(output_dir, "rankings_3y.json"))
-process_rankings(os.path.join(base_dir, "Stock_Analysis_Report_5Year.xlsx"), os.path.join(output_dir, "rankings_5y.json"))
+def run_task(task):
+    # Capture the job's output so the parent prints it as one block instead of interleaving
+    func, args = task
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        func(*args)
+    return log.getvalue()
+
+if __name__ == '__main__':
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    stock_list_files = [
+        os.path.join(base_dir, "StockList (1).csv"),
+        os.path.join(base_dir, "StockList (2).csv"),
+        os.path.join(base_dir, "StockList (3).csv")
+    ]
+
+    tasks = [
+        # 1. Process Rankings
+        (process_rankings, (os.path.join(base_dir, "Stock_Analysis_Report_3Year.xlsx"), os.path.join(output_dir, "rankings_3y.jsonl"))),
+        (process_rankings, (os.path.join(base_dir, "Stock_Analysis_Report_5Year.xlsx"), os.path.join(output_dir, "rankings_5y.jsonl"))),
+
+        # 2. Process Raw Stats
+        (process_raw_stats, (os.path.join(base_dir, "漲跌幅統計(近3年).csv"), os.path.join(output_dir, "raw_stats_3y.json"))),
+        (process_raw_stats, (os.path.join(base_dir, "漲跌幅統計(近5年).csv"), os.path.join(output_dir, "raw_stats_5y.json"))),
 
-# 2. Process Raw Stats
-process_raw_stats(os.path.join(base_dir, "漲跌幅統計(近3年).csv"), os.path.join(output_dir, "raw_stats_3y.json"))
-process_raw_stats(os.path.join(base_dir, "漲跌幅統計(近5年).csv"), os.path.join(output_dir, "raw_stats_5y.json"))
+        # 3. Process Stock Info
+        (process_stock_info, (stock_list_files, os.path.join(output_dir, "stock_info.json"))),
+    ]
 
-# 3. Process Stock Info
-stock_list_files = [
-    os.path.join(base_dir, "StockList (1).csv"),
-    os.path.join(base_dir, "StockList (2).csv"),
-    os.path.join(base_dir, "StockList (3).csv")
-]
-process_stock_info(stock_list_files, os.path.join(output_dir, "stock_info.json"))
+    # The tasks share no state, so run each one in its own process
+    with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+        for log in executor.map(run_task, tasks):
+            print(log, end='')
 
-print("All processing done!")
+    print("All processing done!")
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from process_statistics import process_stock_info
+
+
+def test_stock_info_keeps_date_columns_as_text(tmp_path):
+    csv_path = tmp_path / "StockList (1).csv"
+    csv_path.write_text(
+        "代號,名稱,日期,上市\n"
+        "2330,台積電,2020-01-02,2020-01-03 10:00:00\n"
+        "2317,鴻海,,\n",
+        encoding="cp950",
+    )
+    output_path = tmp_path / "stock_info.json"
+
+    process_stock_info([str(csv_path)], str(output_path))
+
+    # Same text the pandas-based reader produced for this file
+    assert output_path.read_text(encoding="utf-8") == (
+        '[\n'
+        '  {\n'
+        '    "代碼": 2330,\n'
+        '    "名稱": "台積電",\n'
+        '    "日期": "2020-01-02",\n'
+        '    "上市": "2020-01-03 10:00:00"\n'
+        '  },\n'
+        '  {\n'
+        '    "代碼": 2317,\n'
+        '    "名稱": "鴻海",\n'
+        '    "日期": "",\n'
+        '    "上市": ""\n'
+        '  }\n'
+        ']'
+    )